@@ -0,0 +1,39 @@
+"""Import-time benchmark: wall time of fresh interpreters for each module/command.
+
+Run from 0_DataPreparation: ``python bench_import.py [--runs 5]``.
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+CASES = [
+    ("python (leer)", ["-c", "pass"]),
+    ("import features", ["-c", "import features"]),
+    ("import metrics", ["-c", "import metrics"]),
+    ("import gradient_boosting", ["-c", "import gradient_boosting"]),
+    ("import tuning", ["-c", "import tuning"]),
+    ("import neural_net", ["-c", "import neural_net"]),
+    ("cli.py --help", ["cli.py", "--help"]),
+    ("cli.py split", ["cli.py", "split"]),
+]
+
+
+def measure(args, runs):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, *args], check=True, capture_output=True)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    for name, case_args in CASES:
+        print(f"{name:<28} {measure(case_args, args.runs) * 1000:8.0f} ms")
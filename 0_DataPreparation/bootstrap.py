@@ -0,0 +1,67 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+
+def grouped_resample_index(rng, codes, n_resamples):
+    """Index matrix (n_resamples x len(codes)) that resamples rows within each group.
+
+    codes must be sorted; every row is replaced by a random row of its own group, so
+    the group sizes stay the same in every resample.
+    """
+    n_groups = codes[-1] + 1
+    sizes = np.bincount(codes, minlength=n_groups)
+    offsets = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+    positions = rng.random((n_resamples, len(codes))) * sizes[codes]
+    return offsets[codes] + positions.astype(np.int64)
+
+
+def bootstrap_group_means(
+    values, groups, n_boot=10_000, alpha=0.05, seed=42, chunk_size=500, n_jobs=1
+):
+    """Mean and percentile bootstrap CI of every column of values per group.
+
+    values is an (n, k) array (e.g. the six Umsatz_WG_ columns) and groups an array
+    of n group keys (e.g. the weekday). All columns and groups are resampled
+    together through one index matrix per chunk; chunks get their own seeds from a
+    SeedSequence, so the result for a given seed does not depend on n_jobs.
+
+    Returns (labels, mean, lower, upper); the last three have shape (n_groups, k).
+    NaN values are treated as missing and ignored.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if values.ndim == 1:
+        values = values[:, None]
+    labels, codes = np.unique(np.asarray(groups), return_inverse=True)
+
+    order = np.argsort(codes, kind="stable")
+    values, codes = values[order], codes[order]
+    starts = np.flatnonzero(np.r_[True, np.diff(codes) != 0])
+
+    present = ~np.isnan(values)
+    filled = np.where(present, values, 0.0)
+
+    def group_means(index):
+        # index: (m, n) -> (m, n_groups, k) via sums over the sorted group blocks
+        sums = np.add.reduceat(filled[index], starts, axis=1)
+        counts = np.add.reduceat(present[index], starts, axis=1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return sums / counts
+
+    def run_chunk(seed_sequence, n_resamples):
+        rng = np.random.default_rng(seed_sequence)
+        return group_means(grouped_resample_index(rng, codes, n_resamples))
+
+    chunk_sizes = [min(chunk_size, n_boot - i) for i in range(0, n_boot, chunk_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(chunk_sizes))
+    if n_jobs == 1:
+        resampled = [run_chunk(s, m) for s, m in zip(seeds, chunk_sizes)]
+    else:
+        # numpy releases the GIL for the heavy array work, so threads are enough
+        with ThreadPoolExecutor(max_workers=n_jobs) as pool:
+            resampled = list(pool.map(run_chunk, seeds, chunk_sizes))
+    resampled = np.concatenate(resampled)
+
+    mean = group_means(np.arange(len(codes))[None, :])[0]
+    lower, upper = np.nanquantile(resampled, [alpha / 2, 1 - alpha / 2], axis=0)
+    return labels, mean, lower, upper
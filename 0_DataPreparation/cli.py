@@ -0,0 +1,92 @@
+"""Command line entry point for data preparation and the models.
+
+Run from 0_DataPreparation, e.g. ``python cli.py split`` or ``python cli.py gbm``.
+Every command imports its dependencies only when it runs, so data-only commands
+never load sklearn, torch or matplotlib.
+"""
+
+import argparse
+import sys
+
+
+def cmd_merge(args):
+    from features import load_merged_df, load_wide_df
+
+    merged_df = (
+        load_wide_df(args.data_dir) if args.wide else load_merged_df(args.data_dir)
+    )
+    merged_df.to_csv(args.out, index=False)
+    print(f"{len(merged_df)} Zeilen nach {args.out} geschrieben")
+
+
+def cmd_split(args):
+    from features import load_merged_df, split_by_date
+
+    names = ["Training", "Validation", "Test"]
+    for name, df in zip(names, split_by_date(load_merged_df(args.data_dir))):
+        start, end = df["Datum"].min(), df["Datum"].max()
+        print(f"{name}: {df.shape}, {start:%Y-%m-%d} - {end:%Y-%m-%d}")
+
+
+def _run_main(module_name):
+    def run(args):
+        import importlib
+
+        importlib.import_module(module_name).main()
+
+    return run
+
+
+COMMANDS = {
+    "merge": (cmd_merge, "write the Datum x Warengruppe panel as CSV"),
+    "split": (cmd_split, "show size and dates of the train/validation/test split"),
+    "validate": (_run_main("validation"), "check the input data and print a report"),
+    "linreg": (_run_main("lin_reg"), "fit the baseline LinearRegression"),
+    "gbm": (_run_main("gradient_boosting"), "train the gradient boosting model"),
+    "nn": (_run_main("neural_net"), "train the neural network"),
+    "tune": (_run_main("tuning"), "hyperparameter search (successive halving)"),
+    "quantiles": (
+        _run_main("quantiles"),
+        "10/50/90 percent quantile forecasts (conformal intervals)",
+    ),
+    "reconcile": (
+        _run_main("reconciliation"),
+        "compare forecast reconciliation methods",
+    ),
+    "weather": (_run_main("weather"), "refresh the weather cache for forecast dates"),
+    "register": (
+        _run_main("registry"),
+        "train per-Warengruppe models and register them",
+    ),
+    "plots": (_run_main("dataframe_merge"), "draw the weekday bar charts"),
+}
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="cli.py", description=__doc__.splitlines()[0])
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    for name, (func, help_text) in COMMANDS.items():
+        sub = subparsers.add_parser(name, help=help_text)
+        sub.set_defaults(func=func)
+        # The model commands always read Internal/, so only these take a folder
+        if name in ("merge", "split"):
+            sub.add_argument(
+                "--data-dir", default="Internal", help="folder with the CSV files"
+            )
+        if name == "merge":
+            sub.add_argument(
+                "--wide",
+                action="store_true",
+                help="one row per Datum with Umsatz_WG_1..6",
+            )
+            sub.add_argument("--out", default="merged_df.csv")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,59 +3,16 @@
 
 # %%
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-import numpy as np
+
+from features import load_wide_df
 
 # %% [markdown]
 # # Import data & Merge
 
 # %%
-# Sales data
-umsatzdaten = pd.read_csv("Internal/umsatzdaten_gekuerzt.csv")
-
-# Weather data
-wetter = pd.read_csv("Internal/wetter.csv")
-
-# Kieler Woche data
-kiwo = pd.read_csv("Internal/kiwo.csv")
-
-# Ensure date format is consistent
-umsatzdaten["Datum"] = pd.to_datetime(umsatzdaten["Datum"])
-kiwo["Datum"] = pd.to_datetime(kiwo["Datum"])
-wetter["Datum"] = pd.to_datetime(wetter["Datum"])
-
-
-# Reshape 'umsatz' so that no duplicate 'Datum' exists
-umsatz = umsatzdaten.pivot_table(
-    index="Datum", columns="Warengruppe", values="Umsatz", aggfunc="sum"
-).reset_index()
-
-# Rename columns to match the desired format
-umsatz.columns = ["Datum"] + [f"Umsatz_WG_{i}" for i in range(1, len(umsatz.columns))]
-
-# Fill NaN values with 0
-umsatz.fillna(0, inplace=True)
-
-# Merge the DataFrames on the 'Datum' column
-merged_df = umsatz.merge(kiwo, on="Datum", how="outer").merge(
-    wetter, on="Datum", how="outer"
-)
-
-# in 'KielerWoche' fill NaN values  with 0
-merged_df["KielerWoche"] = merged_df["KielerWoche"].fillna(
-    0
-)  # 0 = no Kieler Woche, 1 = Kieler Woche
-
-# Ensure 'Datum' to datetime and extract the year, day of the year, and weekday
-merged_df["Datum"] = pd.to_datetime(merged_df["Datum"])
-
-
-# Constructing new variables for later use
-merged_df["Jahr"] = merged_df["Datum"].dt.year
-merged_df["Monat"] = merged_df["Datum"].dt.month
-merged_df["Tag_im_Jahr"] = merged_df["Datum"].dt.dayofyear
-merged_df["Wochentag"] = merged_df["Datum"].dt.weekday + 1  # 1=Monday, 7=Sunday
+# Sales per Warengruppe (Umsatz_WG_1..6), Kieler Woche and weather per Datum,
+# plus Jahr, Monat, Tag_im_Jahr and Wochentag (1=Monday, 7=Sunday)
+merged_df = load_wide_df()
 
 
 print(merged_df.head())
@@ -90,6 +47,11 @@ print(merged_df.isnull().sum())
 # Quick visualization of the distributions of the variables. Attention! this is for all the data altogether + we need to convert some variables to categorical
 
 # %%
+# Plotting libraries are only needed from here on; the cells above just load the
+# data (scripts that only need the data can call features.load_wide_df() directly)
+import matplotlib.pyplot as plt
+import numpy as np
+import seaborn as sns
 
 numerical_cols = merged_df.select_dtypes(include=["int64", "float64"]).columns
 
@@ -0,0 +1,214 @@
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+# Split dates for training, validation and test
+TRAIN_START = "2013-07-01"
+TRAIN_END = "2017-07-31"
+VALIDATION_END = "2018-07-31"
+TEST_END = "2019-07-31"
+
+# Model inputs: calendar, events and weather
+CATEGORICAL_FEATURES = ["Warengruppe", "Wochentag", "Monat"]
+NUMERIC_FEATURES = [
+    "Jahr",
+    "Tag_im_Jahr",
+    "KielerWoche",
+    "holiday",
+    "Bewoelkung",
+    "Temperatur",
+    "Windgeschwindigkeit",
+    "Wettercode",
+]
+FEATURES = CATEGORICAL_FEATURES + NUMERIC_FEATURES
+WEATHER_COLUMNS = ["Bewoelkung", "Temperatur", "Windgeschwindigkeit", "Wettercode"]
+TARGET = "Umsatz"
+
+# School holidays in Schleswig-Holstein (start_date, end_date)
+FERIEN = [
+    ("2012-10-04", "2012-10-19"),
+    ("2012-12-24", "2013-01-05"),
+    ("2013-03-25", "2013-04-09"),
+    ("2013-05-10", "2013-05-10"),
+    ("2013-06-24", "2013-08-03"),
+    ("2013-10-04", "2013-10-18"),
+    ("2013-12-23", "2014-01-06"),
+    ("2014-04-16", "2014-05-02"),
+    ("2014-05-30", "2014-05-30"),
+    ("2014-07-14", "2014-08-23"),
+    ("2014-10-13", "2014-10-25"),
+    ("2014-12-22", "2015-01-06"),
+    ("2015-04-01", "2015-04-17"),
+    ("2015-05-15", "2015-05-15"),
+    ("2015-07-20", "2015-08-29"),
+    ("2015-10-19", "2015-10-31"),
+    ("2015-12-21", "2016-01-06"),
+    ("2016-03-24", "2016-04-09"),
+    ("2016-05-06", "2016-05-06"),
+    ("2016-07-25", "2016-09-03"),
+    ("2016-10-17", "2016-10-29"),
+    ("2016-12-23", "2017-01-06"),
+    ("2017-04-07", "2017-04-21"),
+    ("2017-05-26", "2017-05-26"),
+    ("2017-07-24", "2017-09-02"),
+    ("2017-10-16", "2017-10-27"),
+    ("2017-12-21", "2018-01-06"),
+    ("2018-03-29", "2018-04-13"),
+    ("2018-05-11", "2018-05-11"),
+    ("2018-07-09", "2018-08-18"),
+    ("2018-10-01", "2018-10-19"),
+    ("2018-12-21", "2019-01-04"),
+    ("2019-04-04", "2019-04-18"),
+    ("2019-05-31", "2019-05-31"),
+    ("2019-07-01", "2019-08-10"),
+]
+
+
+def read_internal(data_dir="Internal", validate=True):
+    """Read sales, weather and Kieler Woche data with parsed Datum columns.
+
+    With validate the raw tables are checked first (validation.validate_inputs), so
+    bad input raises DataValidationError before any merge.
+    """
+    umsatzdaten = pd.read_csv(f"{data_dir}/umsatzdaten_gekuerzt.csv")
+    wetter = pd.read_csv(f"{data_dir}/wetter.csv")
+    kiwo = pd.read_csv(f"{data_dir}/kiwo.csv")
+
+    if validate:
+        from validation import validate_inputs
+
+        validate_inputs(umsatzdaten, wetter, kiwo)
+
+    # Ensure date format is consistent
+    umsatzdaten["Datum"] = pd.to_datetime(umsatzdaten["Datum"])
+    kiwo["Datum"] = pd.to_datetime(kiwo["Datum"])
+    wetter["Datum"] = pd.to_datetime(wetter["Datum"])
+    return umsatzdaten, wetter, kiwo
+
+
+def add_date_features(df):
+    df["Jahr"] = df["Datum"].dt.year
+    df["Monat"] = df["Datum"].dt.month
+    df["Tag_im_Jahr"] = df["Datum"].dt.dayofyear
+    df["Wochentag"] = df["Datum"].dt.weekday + 1  # 1=Monday, 7=Sunday
+    return df
+
+
+def load_wide_df(data_dir="Internal", how="outer", validate=True):
+    """One row per Datum with the sales of each Warengruppe in Umsatz_WG_1..6.
+
+    This is the frame of dataframe_merge_georgia.py (how="outer") and
+    dataframe_merge.py (how="left", only dates with sales).
+    """
+    umsatzdaten, wetter, kiwo = read_internal(data_dir, validate)
+
+    # Reshape 'umsatz' so that no duplicate 'Datum' exists
+    umsatz = umsatzdaten.pivot_table(
+        index="Datum", columns="Warengruppe", values="Umsatz", aggfunc="sum"
+    ).reset_index()
+    umsatz.columns = ["Datum"] + [f"Umsatz_WG_{i}" for i in umsatz.columns[1:]]
+    umsatz = umsatz.fillna(0)
+
+    merged_df = umsatz.merge(kiwo, on="Datum", how=how).merge(
+        wetter, on="Datum", how=how
+    )
+    merged_df["KielerWoche"] = merged_df["KielerWoche"].fillna(0)
+    return add_date_features(merged_df)
+
+
+def load_merged_df(data_dir="Internal", validate=True):
+    """Build the Datum x Warengruppe panel of base_df.py."""
+    umsatzdaten, wetter, kiwo = read_internal(data_dir, validate)
+
+    # Every date of the outer merge gets all 6 Warengruppen
+    all_dates = pd.DataFrame(
+        {
+            "Datum": pd.concat(
+                [umsatzdaten["Datum"], kiwo["Datum"], wetter["Datum"]]
+            ).unique()
+        }
+    )
+    all_warengruppen = pd.DataFrame({"Warengruppe": range(1, 7)})
+    all_combinations = all_dates.merge(all_warengruppen, how="cross")
+
+    # Sales per (Datum, Warengruppe); Kieler Woche and weather per Datum only, so
+    # the rows added by the cross join still get their weather values
+    merged_df = all_combinations.merge(
+        umsatzdaten.drop(columns="id"), on=["Datum", "Warengruppe"], how="left"
+    )
+    merged_df = merged_df.merge(kiwo, on="Datum", how="left").merge(
+        wetter, on="Datum", how="left"
+    )
+    merged_df = merged_df.sort_values(["Datum", "Warengruppe"]).reset_index(drop=True)
+
+    return _finish_panel(merged_df)
+
+
+def build_forecast_df(dates, weather_df, data_dir="Internal"):
+    """Datum x Warengruppe feature rows for (future) dates without sales.
+
+    weather_df holds Datum and WEATHER_COLUMNS (e.g. from weather.WeatherCache);
+    Kieler Woche comes from kiwo.csv and is 0 for dates not listed there.
+    """
+    kiwo = pd.read_csv(f"{data_dir}/kiwo.csv")
+    kiwo["Datum"] = pd.to_datetime(kiwo["Datum"])
+
+    all_dates = pd.DataFrame({"Datum": pd.to_datetime(pd.Index(dates)).unique()})
+    all_warengruppen = pd.DataFrame({"Warengruppe": range(1, 7)})
+    merged_df = all_dates.merge(all_warengruppen, how="cross")
+    merged_df[TARGET] = float("nan")
+    merged_df = merged_df.merge(kiwo, on="Datum", how="left").merge(
+        weather_df[["Datum"] + WEATHER_COLUMNS], on="Datum", how="left"
+    )
+    merged_df = merged_df.sort_values(["Datum", "Warengruppe"]).reset_index(drop=True)
+    return _finish_panel(merged_df)
+
+
+def _finish_panel(merged_df):
+    # Constructing new variables
+    merged_df = add_date_features(merged_df)
+    merged_df["KielerWoche"] = merged_df["KielerWoche"].fillna(0)
+
+    merged_df["holiday"] = 0
+    for start, end in FERIEN:
+        mask = merged_df["Datum"].between(pd.to_datetime(start), pd.to_datetime(end))
+        merged_df.loc[mask, "holiday"] = 1
+
+    # ID in the format yymmddX (e.g., 1307053 for 2013-07-05, Warengruppe 3)
+    merged_df["Warengruppe"] = merged_df["Warengruppe"].astype(int)
+    merged_df["id"] = (
+        merged_df["Datum"].dt.strftime("%y%m%d") + merged_df["Warengruppe"].astype(str)
+    ).astype(int)
+
+    # Downcast to 32 bit
+    for col in merged_df.select_dtypes(include=["float", "int"]).columns:
+        if pd.api.types.is_float_dtype(merged_df[col]):
+            merged_df[col] = merged_df[col].astype("float32")
+        else:
+            merged_df[col] = merged_df[col].astype("int32")
+
+    return merged_df
+
+
+def split_by_date(merged_df):
+    """Return (training_df, validation_df, test_df) using the project split dates."""
+    datum = merged_df["Datum"]
+    training_df = merged_df[(datum >= TRAIN_START) & (datum <= TRAIN_END)]
+    validation_df = merged_df[(datum > TRAIN_END) & (datum <= VALIDATION_END)]
+    test_df = merged_df[(datum > VALIDATION_END) & (datum <= TEST_END)]
+    return training_df, validation_df, test_df
+
+
+def data_hash(arrays):
+    """sha1 hex digest of a dict of arrays (names, shapes, dtypes and values).
+
+    Identifies the training data of a tuning run or a registered model, e.g.
+    data_hash({"X": X_train, "y": y_train}).
+    """
+    digest = hashlib.sha1()
+    for name in sorted(arrays):
+        array = np.ascontiguousarray(arrays[name])
+        digest.update(f"{name}:{array.shape}:{array.dtype.str}".encode())
+        digest.update(array.tobytes())
+    return digest.hexdigest()
@@ -0,0 +1,85 @@
+import time
+
+import numpy as np
+
+from features import (
+    CATEGORICAL_FEATURES,
+    FEATURES,
+    TARGET,
+    load_merged_df,
+    split_by_date,
+)
+from metrics import mape_per_warengruppe
+
+
+def feature_matrix(df):
+    """FEATURES of df as a float32 matrix; missing weather stays NaN.
+
+    HistGradientBoostingRegressor bins the raw values itself in every fit (and
+    handles NaN with a missing-value branch), so no binning is done here. The
+    fitted model stores its bin edges and can score any frame built this way.
+    """
+    return df[FEATURES].to_numpy(dtype=np.float32)
+
+
+def make_model(**params):
+    # sklearn is imported here so that importing this module stays cheap.
+    # HistGradientBoosting trains with OpenMP on all available cores.
+    from sklearn.ensemble import HistGradientBoostingRegressor
+
+    defaults = dict(
+        learning_rate=0.05,
+        max_iter=500,
+        max_leaf_nodes=31,
+        min_samples_leaf=20,
+        l2_regularization=0.0,
+        early_stopping=False,
+        random_state=42,
+    )
+    defaults.update(params)
+    return HistGradientBoostingRegressor(
+        categorical_features=[FEATURES.index(col) for col in CATEGORICAL_FEATURES],
+        **defaults,
+    )
+
+
+def main():
+    start = time.perf_counter()
+
+    merged_df = load_merged_df()
+    training_df, validation_df, test_df = split_by_date(merged_df)
+
+    # Only rows with known sales can be used for fitting and evaluation
+    training_df = training_df.dropna(subset=[TARGET])
+    validation_df = validation_df.dropna(subset=[TARGET])
+
+    X_train, X_val = feature_matrix(training_df), feature_matrix(validation_df)
+    y_train = training_df[TARGET].to_numpy()
+    y_val = validation_df[TARGET].to_numpy()
+    wg_val = validation_df["Warengruppe"].to_numpy()
+
+    # Small grid over the most important parameters; all fits share the same matrices
+    grid = [
+        dict(learning_rate=lr, max_leaf_nodes=leaves)
+        for lr in (0.03, 0.1)
+        for leaves in (15, 31, 63)
+    ]
+
+    best = None
+    for params in grid:
+        modell = make_model(**params).fit(X_train, y_train)
+        mape = mape_per_warengruppe(wg_val, y_val, modell.predict(X_val))
+        mean_mape = np.mean(list(mape.values()))
+        print(f"{params} -> mittlere MAPE {mean_mape:.2f}%")
+        if best is None or mean_mape < best[0]:
+            best = (mean_mape, params, mape)
+
+    print("\nBeste Parameter:", best[1])
+    print("MAPE pro Warengruppe (Validierung):")
+    for wg, value in best[2].items():
+        print(f"  Warengruppe {wg}: {value:.2f}%")
+    print(f"\nLaufzeit: {time.perf_counter() - start:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
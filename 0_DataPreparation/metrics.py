@@ -0,0 +1,187 @@
+import numpy as np
+
+from bootstrap import grouped_resample_index
+
+METRICS = ["MAPE", "sMAPE", "MAE", "RMSE", "Bias"]
+
+
+def _row_terms(y_true, y_pred):
+    # Per-row quantities behind all metrics; computed once, summed per group later
+    error = y_pred - y_true
+    nonzero = y_true != 0
+    ape = np.zeros_like(error)
+    np.divide(np.abs(error), np.abs(y_true), out=ape, where=nonzero)
+    denominator = np.abs(y_true) + np.abs(y_pred)
+    sape = np.zeros_like(error)
+    np.divide(2 * np.abs(error), denominator, out=sape, where=denominator != 0)
+    return {
+        "n": np.ones_like(error),
+        "n_nonzero": nonzero.astype(np.float64),
+        "ape": ape,
+        "sape": sape,
+        "ae": np.abs(error),
+        "se": error**2,
+        "error": error,
+    }
+
+
+def _sums(terms, codes, n_groups):
+    # All per-group sums in one bincount per quantity
+    return {
+        name: np.bincount(codes, weights=values, minlength=n_groups)
+        for name, values in terms.items()
+    }
+
+
+def _from_sums(sums):
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return {
+            "MAPE": 100 * sums["ape"] / sums["n_nonzero"],
+            "sMAPE": 100 * sums["sape"] / sums["n"],
+            "MAE": sums["ae"] / sums["n"],
+            "RMSE": np.sqrt(sums["se"] / sums["n"]),
+            "Bias": sums["error"] / sums["n"],
+        }
+
+
+def group_codes(*keys):
+    """Combine one or more key arrays into dense codes 0..n_groups-1.
+
+    Returns (codes, labels) where labels[i] is the key tuple of group i (or the
+    plain key if only one array is given).
+    """
+    keys = [np.asarray(key) for key in keys]
+    key = keys[0]
+    if (
+        len(keys) == 1
+        and key.dtype.kind in "iu"
+        and key.size
+        and 0 <= key.min()
+        and key.max() < 1 << 16
+    ):
+        # Small non-negative integer keys (Warengruppe, Wochentag, Monat): one
+        # bincount instead of the sort in np.unique
+        present = np.bincount(key) > 0
+        return (np.cumsum(present) - 1)[key], np.flatnonzero(present).astype(key.dtype)
+    stacked = np.stack(keys, axis=1) if len(keys) > 1 else keys[0]
+    labels, codes = np.unique(stacked, axis=0, return_inverse=True)
+    if len(keys) > 1:
+        labels = [tuple(row) for row in labels.tolist()]
+    return codes.ravel(), labels
+
+
+def forecast_metrics(y_true, y_pred, groups=None):
+    """MAPE, sMAPE, MAE, RMSE and Bias (mean of y_pred - y_true) per group.
+
+    groups is an array of group keys (e.g. Warengruppe); without it one overall group
+    is used. Rows with missing y_true are ignored and rows with y_true == 0 do not
+    count towards MAPE. Returns (labels, {metric: array with one value per label}).
+    """
+    y_true = np.asarray(y_true, dtype=np.float64)
+    y_pred = np.asarray(y_pred, dtype=np.float64)
+    if groups is None:
+        groups = np.zeros(len(y_true), dtype=np.int64)
+    groups = np.asarray(groups)
+
+    mask = ~np.isnan(y_true)
+    codes, labels = group_codes(groups[mask])
+    sums = _sums(_row_terms(y_true[mask], y_pred[mask]), codes, len(labels))
+    return labels, _from_sums(sums)
+
+
+def metrics_breakdown(
+    df, y_pred, target="Umsatz", by=("Warengruppe", "Wochentag", "Monat")
+):
+    """forecast_metrics of df[target] vs y_pred for each column in by.
+
+    The per-row errors are computed once; each column then only needs its group
+    codes and one bincount per quantity. Returns {column: {label: {metric: value}}}.
+    """
+    y_true = df[target].to_numpy(dtype=np.float64)
+    mask = ~np.isnan(y_true)
+    terms = _row_terms(y_true[mask], np.asarray(y_pred, dtype=np.float64)[mask])
+
+    result = {}
+    for col in by:
+        codes, labels = group_codes(df[col].to_numpy()[mask])
+        values = _from_sums(_sums(terms, codes, len(labels)))
+        result[col] = {
+            label.item() if hasattr(label, "item") else label: {
+                name: float(values[name][i]) for name in METRICS
+            }
+            for i, label in enumerate(labels)
+        }
+    return result
+
+
+def pinball_loss(y_true, q_pred, quantiles, groups=None):
+    """Mean pinball (quantile) loss per group and quantile.
+
+    q_pred has one column per quantile. Returns (labels, array n_groups x n_q).
+    """
+    y_true = np.asarray(y_true, dtype=np.float64)
+    q_pred = np.asarray(q_pred, dtype=np.float64)
+    if groups is None:
+        groups = np.zeros(len(y_true), dtype=np.int64)
+    groups = np.asarray(groups)
+
+    mask = ~np.isnan(y_true)
+    codes, labels = group_codes(groups[mask])
+    diff = y_true[mask, None] - q_pred[mask]
+    q = np.asarray(quantiles)[None, :]
+    loss = np.maximum(q * diff, (q - 1) * diff)
+
+    n_groups, n_q = len(labels), len(quantiles)
+    flat_codes = (codes[:, None] * n_q + np.arange(n_q)).ravel()
+    sums = np.bincount(flat_codes, weights=loss.ravel(), minlength=n_groups * n_q)
+    counts = np.bincount(codes, minlength=n_groups)[:, None]
+    return labels, sums.reshape(n_groups, n_q) / counts
+
+
+def mape_per_warengruppe(warengruppe, y_true, y_pred):
+    labels, values = forecast_metrics(y_true, y_pred, warengruppe)
+    return {int(wg): float(mape) for wg, mape in zip(labels, values["MAPE"])}
+
+
+def bootstrap_ci(
+    y_true, y_pred, groups=None, n_boot=1000, alpha=0.05, seed=42, chunk_size=200
+):
+    """Percentile bootstrap confidence intervals for all metrics per group.
+
+    Rows are resampled within each group. All resamples of a chunk are evaluated at
+    once: the index matrix (chunk_size x n) is flattened and every (resample, group)
+    pair gets its own bincount bin.
+
+    Returns (labels, {metric: array of shape (n_groups, 2)}) with lower/upper bounds.
+    """
+    y_true = np.asarray(y_true, dtype=np.float64)
+    y_pred = np.asarray(y_pred, dtype=np.float64)
+    if groups is None:
+        groups = np.zeros(len(y_true), dtype=np.int64)
+    groups = np.asarray(groups)
+
+    mask = ~np.isnan(y_true)
+    y_true, y_pred = y_true[mask], y_pred[mask]
+    codes, labels = group_codes(groups[mask])
+    n_groups = len(labels)
+
+    order = np.argsort(codes, kind="stable")
+    codes = codes[order]
+    terms = {name: values[order] for name, values in _row_terms(y_true, y_pred).items()}
+
+    rng = np.random.default_rng(seed)
+    samples = {name: [] for name in METRICS}
+    for start in range(0, n_boot, chunk_size):
+        n_chunk = min(chunk_size, n_boot - start)
+        index = grouped_resample_index(rng, codes, n_chunk)
+        boot_codes = (np.arange(n_chunk)[:, None] * n_groups + codes).ravel()
+        resampled = {name: values[index].ravel() for name, values in terms.items()}
+        sums = _sums(resampled, boot_codes, n_chunk * n_groups)
+        for name, values in _from_sums(sums).items():
+            samples[name].append(values.reshape(n_chunk, n_groups))
+
+    intervals = {}
+    for name in METRICS:
+        values = np.concatenate(samples[name])
+        intervals[name] = np.nanquantile(values, [alpha / 2, 1 - alpha / 2], axis=0).T
+    return labels, intervals
@@ -0,0 +1,192 @@
+import copy
+import os
+import time
+
+import numpy as np
+import torch
+from torch import nn
+
+from features import (
+    CATEGORICAL_FEATURES,
+    NUMERIC_FEATURES,
+    TARGET,
+    load_merged_df,
+    split_by_date,
+)
+from metrics import mape_per_warengruppe
+
+# Number of categories per embedding (Warengruppe 1-6, Wochentag 1-7, Monat 1-12)
+CARDINALITIES = {"Warengruppe": 6, "Wochentag": 7, "Monat": 12}
+
+
+class PanelArrays:
+    """Pre-built float32/int64 tensors for one split of the panel.
+
+    Numeric features are standardised with the training statistics and missing
+    weather values are set to 0 (= training mean). The target is log1p(Umsatz).
+    """
+
+    def __init__(self, df, mean, std):
+        self.categorical = torch.from_numpy(
+            df[CATEGORICAL_FEATURES].to_numpy(dtype=np.int64) - 1
+        )
+        numeric = (df[NUMERIC_FEATURES].to_numpy(dtype=np.float32) - mean) / std
+        self.numeric = torch.from_numpy(np.nan_to_num(numeric, nan=0.0))
+        self.target = torch.from_numpy(np.log1p(df[TARGET].to_numpy(dtype=np.float32)))
+
+    def __len__(self):
+        return len(self.target)
+
+
+class BatchLoader:
+    """Yields (categorical, numeric, target) batches by slicing whole tensors.
+
+    Shuffling is a single permutation per epoch, so there is no per-sample work.
+    """
+
+    def __init__(self, arrays, batch_size=256, shuffle=False, seed=42):
+        self.arrays = arrays
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+        self.generator = torch.Generator().manual_seed(seed)
+
+    def __iter__(self):
+        n = len(self.arrays)
+        if self.shuffle:
+            order = torch.randperm(n, generator=self.generator)
+            categorical = self.arrays.categorical[order]
+            numeric = self.arrays.numeric[order]
+            target = self.arrays.target[order]
+        else:
+            categorical = self.arrays.categorical
+            numeric = self.arrays.numeric
+            target = self.arrays.target
+        for start in range(0, n, self.batch_size):
+            stop = start + self.batch_size
+            yield categorical[start:stop], numeric[start:stop], target[start:stop]
+
+
+class SalesNet(nn.Module):
+    def __init__(self, n_numeric, embedding_dim=4, hidden=(64, 32), dropout=0.1):
+        super().__init__()
+        self.embeddings = nn.ModuleList(
+            nn.Embedding(CARDINALITIES[col], embedding_dim)
+            for col in CATEGORICAL_FEATURES
+        )
+        layers = []
+        width = embedding_dim * len(CATEGORICAL_FEATURES) + n_numeric
+        for size in hidden:
+            layers += [nn.Linear(width, size), nn.ReLU(), nn.Dropout(dropout)]
+            width = size
+        layers.append(nn.Linear(width, 1))
+        self.mlp = nn.Sequential(*layers)
+
+    def forward(self, categorical, numeric):
+        embedded = [emb(categorical[:, i]) for i, emb in enumerate(self.embeddings)]
+        return self.mlp(torch.cat(embedded + [numeric], dim=1)).squeeze(1)
+
+
+def predict(modell, arrays, batch_size=8192):
+    """Predict Umsatz for all rows of arrays (large batches, all threads)."""
+    modell.eval()
+    outputs = []
+    with torch.inference_mode():
+        for categorical, numeric, _ in BatchLoader(arrays, batch_size=batch_size):
+            outputs.append(modell(categorical, numeric))
+    return np.expm1(torch.cat(outputs).numpy())
+
+
+def train(
+    train_arrays,
+    val_arrays,
+    epochs=200,
+    patience=15,
+    lr=1e-3,
+    batch_size=256,
+    seed=42,
+    **model_params,
+):
+    """Train SalesNet with early stopping on the validation loss.
+
+    Returns the model with the weights of the best validation epoch. Both splits
+    need at least one row and a finite target everywhere (drop rows without sales
+    first); otherwise the loss is NaN and no epoch could be selected.
+    """
+    for name, arrays in (("training", train_arrays), ("validation", val_arrays)):
+        if len(arrays) == 0:
+            raise ValueError(f"The {name} split has no rows")
+        if not torch.isfinite(arrays.target).all():
+            raise ValueError(f"The {name} split has missing or invalid Umsatz values")
+
+    torch.manual_seed(seed)
+    modell = SalesNet(train_arrays.numeric.shape[1], **model_params)
+    optimizer = torch.optim.Adam(modell.parameters(), lr=lr)
+    loss_fn = nn.L1Loss()  # L1 on log sales is close to optimising MAPE
+    loader = BatchLoader(train_arrays, batch_size=batch_size, shuffle=True, seed=seed)
+
+    best_loss, best_state, epochs_without_improvement = np.inf, None, 0
+    for epoch in range(epochs):
+        modell.train()
+        for categorical, numeric, target in loader:
+            optimizer.zero_grad()
+            loss = loss_fn(modell(categorical, numeric), target)
+            loss.backward()
+            optimizer.step()
+
+        modell.eval()
+        with torch.inference_mode():
+            val_loss = loss_fn(
+                modell(val_arrays.categorical, val_arrays.numeric), val_arrays.target
+            ).item()
+
+        if val_loss < best_loss:
+            best_loss, epochs_without_improvement = val_loss, 0
+            best_state = copy.deepcopy(modell.state_dict())
+        else:
+            epochs_without_improvement += 1
+            if epochs_without_improvement >= patience:
+                print(f"Early stopping nach Epoche {epoch + 1}")
+                break
+
+    # Without any finite validation loss the weights of the last epoch are kept
+    if best_state is not None:
+        modell.load_state_dict(best_state)
+    return modell
+
+
+def main():
+    # CPU only: use all cores for the matrix multiplications. Set here and not at
+    # import time, so importing this module does not change the caller's setting.
+    torch.set_num_threads(os.cpu_count() or 1)
+    start = time.perf_counter()
+
+    merged_df = load_merged_df()
+    training_df, validation_df, test_df = split_by_date(merged_df)
+
+    # Only rows with known sales can be used for fitting and evaluation
+    training_df = training_df.dropna(subset=[TARGET])
+    validation_df = validation_df.dropna(subset=[TARGET])
+
+    numeric_train = training_df[NUMERIC_FEATURES].to_numpy(dtype=np.float32)
+    mean = np.nanmean(numeric_train, axis=0)
+    std = np.nanstd(numeric_train, axis=0) + 1e-6
+
+    train_arrays = PanelArrays(training_df, mean, std)
+    val_arrays = PanelArrays(validation_df, mean, std)
+
+    modell = train(train_arrays, val_arrays)
+
+    y_pred = predict(modell, val_arrays)
+    mape = mape_per_warengruppe(
+        validation_df["Warengruppe"].to_numpy(),
+        validation_df[TARGET].to_numpy(),
+        y_pred,
+    )
+    print("MAPE pro Warengruppe (Validierung):")
+    for wg, value in mape.items():
+        print(f"  Warengruppe {wg}: {value:.2f}%")
+    print(f"\nLaufzeit: {time.perf_counter() - start:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
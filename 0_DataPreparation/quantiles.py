@@ -0,0 +1,147 @@
+import numpy as np
+
+from metrics import group_codes, pinball_loss
+
+DEFAULT_QUANTILES = (0.1, 0.5, 0.9)
+
+# Point forecasts below this (in Euro) get additive residual quantiles instead of
+# the multiplicative factors, which would collapse or reverse the interval
+Y_HAT_FLOOR = 1.0
+
+
+def grouped_quantiles(values, groups, quantiles, conformal=False):
+    """Quantiles of values per group, all groups and quantiles in one pass.
+
+    Sorts once by (group, value) and interpolates linearly between order
+    statistics like np.quantile. With conformal=True the finite-sample conformal
+    order statistic is used instead: rank ceil((n + 1) q) for q >= 0.5 and
+    floor((n + 1) q) for q < 0.5 (clipped to 1..n), i.e. the level
+    ceil((n + 1) q) / n, so an interval between two such quantiles covers a new
+    exchangeable value with at least the nominal probability.
+    Returns (labels, array n_groups x n_quantiles).
+    """
+    codes, labels = group_codes(groups)
+    order = np.lexsort((values, codes))
+    values, codes = values[order], codes[order]
+    sizes = np.bincount(codes, minlength=len(labels))
+    offsets = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+    q = np.asarray(quantiles)[None, :]
+
+    if conformal:
+        scaled = (sizes[:, None] + 1) * q
+        rank = np.where(q >= 0.5, np.ceil(scaled), np.floor(scaled))
+        rank = np.clip(rank, 1, sizes[:, None]).astype(np.int64)
+        return labels, values[offsets[:, None] + rank - 1]
+
+    position = q * (sizes[:, None] - 1)
+    lower = np.floor(position).astype(np.int64)
+    upper = np.minimum(lower + 1, sizes[:, None] - 1)
+    weight = position - lower
+    low_values = values[offsets[:, None] + lower]
+    high_values = values[offsets[:, None] + upper]
+    return labels, low_values + weight * (high_values - low_values)
+
+
+class ConformalQuantileModel:
+    """Prediction intervals from the residuals of a fitted point model.
+
+    calibrate() stores the conformal quantiles of log(y / y_hat) per Warengruppe
+    on a calibration window, and of the additive residuals y - y_hat for point
+    forecasts below Y_HAT_FLOOR. predict() is the point forecast of the wrapped
+    model; predict_quantiles() calls it once as well and scales it with the stored
+    factors, so more quantiles do not mean more model evaluations.
+    """
+
+    def __init__(self, model, quantiles=DEFAULT_QUANTILES):
+        self.model = model
+        self.quantiles = tuple(sorted(quantiles))
+
+    def calibrate(self, X, y, warengruppe):
+        y = np.asarray(y, dtype=np.float64)
+        y_hat = self.model.predict(X)
+        warengruppe = np.asarray(warengruppe)
+        known = ~np.isnan(y)
+        # Relative residuals for the rows predict_quantiles() scales (y_hat at or
+        # above the floor), additive residuals from all rows for the others
+        mask = known & (y > 0) & (y_hat >= Y_HAT_FLOOR)
+        labels, table = grouped_quantiles(
+            np.log(y[mask] / y_hat[mask]), warengruppe[mask], self.quantiles, True
+        )
+        additive_labels, offsets = grouped_quantiles(
+            y[known] - y_hat[known], warengruppe[known], self.quantiles, True
+        )
+        self.labels_ = np.asarray(labels)
+        self.factors_ = np.exp(table)  # n_groups x n_quantiles
+        rows = np.searchsorted(np.asarray(additive_labels), self.labels_)
+        self.offsets_ = offsets[rows]
+        return self
+
+    def predict(self, X):
+        return self.model.predict(X)
+
+    def predict_quantiles(self, X, warengruppe):
+        """Forecasts for all quantiles as an array (n_rows x n_quantiles).
+
+        Columns follow self.quantiles and are non-decreasing in every row; sales
+        cannot be negative, so the quantiles are clipped at 0.
+        """
+        y_hat = self.predict(X)
+        warengruppe = np.asarray(warengruppe)
+        unknown = ~np.isin(warengruppe, self.labels_)
+        if unknown.any():
+            raise ValueError(
+                f"No calibration data for Warengruppe {np.unique(warengruppe[unknown])}"
+            )
+        rows = np.searchsorted(self.labels_, warengruppe)
+        low = (y_hat < Y_HAT_FLOOR)[:, None]
+        q_pred = np.where(
+            low,
+            y_hat[:, None] + self.offsets_[rows],
+            np.maximum(y_hat, Y_HAT_FLOOR)[:, None] * self.factors_[rows],
+        )
+        # Factors and offsets increase along the (sorted) quantiles, the running
+        # maximum only guards against rounding
+        return np.maximum(np.maximum.accumulate(q_pred, axis=1), 0.0)
+
+
+def main():
+    from features import TARGET, load_merged_df, split_by_date
+    from gradient_boosting import feature_matrix, make_model
+
+    merged_df = load_merged_df()
+    training_df, validation_df, test_df = split_by_date(merged_df)
+    training_df = training_df.dropna(subset=[TARGET])
+    validation_df = validation_df.dropna(subset=[TARGET])
+
+    # Calibrate on odd and check on even ISO weeks of the validation year, so both
+    # halves cover all seasons (and Warengruppe 6, which only sells in autumn)
+    odd_week = (validation_df["Datum"].dt.isocalendar().week % 2 == 1).to_numpy()
+    calibration_df = validation_df[odd_week]
+    evaluation_df = validation_df[~odd_week]
+
+    X_train, X_cal, X_eval = (
+        feature_matrix(df) for df in (training_df, calibration_df, evaluation_df)
+    )
+    modell = make_model(learning_rate=0.1, max_leaf_nodes=63)
+    modell.fit(X_train, training_df[TARGET].to_numpy())
+
+    quantile_model = ConformalQuantileModel(modell).calibrate(
+        X_cal, calibration_df[TARGET].to_numpy(), calibration_df["Warengruppe"]
+    )
+    wg = evaluation_df["Warengruppe"].to_numpy()
+    y_true = evaluation_df[TARGET].to_numpy()
+    q_pred = quantile_model.predict_quantiles(X_eval, wg)
+
+    labels, losses = pinball_loss(y_true, q_pred, quantile_model.quantiles, wg)
+    inside = (y_true >= q_pred[:, 0]) & (y_true <= q_pred[:, -1])
+    coverage = np.bincount(wg, weights=inside)[labels] / np.bincount(wg)[labels]
+
+    q_low, q_high = quantile_model.quantiles[0], quantile_model.quantiles[-1]
+    print(f"Abdeckung {q_low:.0%}-{q_high:.0%} Intervall und Pinball-Loss pro Quantil:")
+    for i, label in enumerate(labels):
+        loss = " ".join(f"{value:7.2f}" for value in losses[i])
+        print(f"  Warengruppe {label}: {coverage[i]:6.1%}  {loss}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+import numpy as np
+from scipy import sparse
+from scipy.sparse.linalg import splu
+
+from features import TARGET, load_merged_df, split_by_date
+from metrics import forecast_metrics
+
+# Floor for residual standard deviations and variance weights; a series that is
+# forecast perfectly in-sample (e.g. always 0) would otherwise divide by zero
+EPS = 1e-8
+
+
+def summing_matrix(n_branches, n_groups=6):
+    """Sparse summing matrix S for total -> branches -> Warengruppen.
+
+    The bottom series are ordered branch by branch (branch 0 groups 1..n_groups,
+    branch 1 ...). Rows of S: the overall total, one total per branch (only if there
+    is more than one branch) and the bottom series themselves, so that
+    all_series = S @ bottom_series.
+    """
+    n_bottom = n_branches * n_groups
+    blocks = [sparse.csr_matrix(np.ones((1, n_bottom)))]
+    if n_branches > 1:
+        blocks.append(sparse.kron(sparse.eye(n_branches), np.ones((1, n_groups))))
+    blocks.append(sparse.eye(n_bottom))
+    return sparse.vstack(blocks, format="csr")
+
+
+def bottom_up(S, bottom_forecasts):
+    """Aggregate bottom forecasts (n_bottom x T) to all levels."""
+    return S @ bottom_forecasts
+
+
+def historical_proportions(bottom_history):
+    """Average share of each bottom series in the total (history is n_bottom x T)."""
+    totals = np.nansum(bottom_history, axis=0)
+    return np.nansum(bottom_history, axis=1) / totals.sum()
+
+
+def top_down(S, total_forecast, proportions):
+    """Split the total forecast (T,) by fixed proportions and aggregate again."""
+    return S @ np.outer(proportions, total_forecast)
+
+
+def _shrunk_covariance(residuals):
+    # Schäfer-Strimmer shrinkage of the residual covariance towards its diagonal
+    residuals = residuals - residuals.mean(axis=1, keepdims=True)
+    n = residuals.shape[1]
+    covariance = residuals @ residuals.T / n
+    std = np.maximum(np.sqrt(np.diag(covariance)), EPS)
+    scaled = residuals / std[:, None]
+    correlation = scaled @ scaled.T / n
+    # sum_t (x_it x_jt - r_ij)^2 without building the n_all x n_all x T tensor
+    squared = scaled**2
+    var_correlation = n / (n - 1) ** 3 * (squared @ squared.T - n * correlation**2)
+    off_diagonal = ~np.eye(len(std), dtype=bool)
+    denominator = (correlation[off_diagonal] ** 2).sum()
+    lam = var_correlation[off_diagonal].sum() / denominator if denominator > 0 else 1.0
+    lam = min(max(lam, 0.0), 1.0)
+    shrunk = (1 - lam) * correlation
+    np.fill_diagonal(shrunk, 1.0)
+    return shrunk * np.outer(std, std)
+
+
+def reconcile(S, base_forecasts, method="wls_struct", residuals=None):
+    """Make base forecasts for all levels (n_all x T) coherent.
+
+    Computes S (S' W^-1 S)^-1 S' W^-1 y_hat for all T columns at once:
+    - "ols":         W = I
+    - "wls_struct":  W = diag(number of bottom series in each aggregate)
+    - "wls_var":     W = diag(variance of the in-sample residuals)
+    - "mint_shrink": W = shrunk covariance of the in-sample residuals (MinT)
+    residuals (n_all x T_train) are needed for "wls_var" and "mint_shrink".
+    With a diagonal W the system is sparse and solved by one sparse LU.
+    """
+    S = sparse.csr_matrix(S)
+    base_forecasts = np.asarray(base_forecasts, dtype=np.float64)
+    if method in ("wls_var", "mint_shrink"):
+        if residuals is None:
+            raise ValueError(f"Method {method!r} needs in-sample residuals")
+        residuals = np.asarray(residuals, dtype=np.float64)
+        if residuals.ndim != 2 or residuals.shape[0] != S.shape[0]:
+            raise ValueError(
+                f"residuals must have shape ({S.shape[0]}, T), got {residuals.shape}"
+            )
+
+    if method == "mint_shrink":
+        W = _shrunk_covariance(residuals)
+        S_dense = S.toarray()
+        W_inv_S = np.linalg.solve(W, S_dense)
+        bottom = np.linalg.solve(S_dense.T @ W_inv_S, W_inv_S.T @ base_forecasts)
+        return S @ bottom
+
+    if method == "ols":
+        weights = np.ones(S.shape[0])
+    elif method == "wls_struct":
+        weights = np.asarray(S.sum(axis=1)).ravel()
+    elif method == "wls_var":
+        weights = np.maximum(np.var(residuals, axis=1), EPS)
+    else:
+        raise ValueError(f"Unknown reconciliation method: {method}")
+
+    W_inv = sparse.diags(1.0 / weights)
+    A = (S.T @ W_inv @ S).tocsc()
+    bottom = splu(A).solve(np.asarray(S.T @ (W_inv @ base_forecasts)))
+    return S @ bottom
+
+
+def panel_to_matrix(df, value_col):
+    """Pivot a Datum x Warengruppe panel into (n_groups x n_dates), NaN -> 0."""
+    wide = df.pivot_table(
+        index="Warengruppe", columns="Datum", values=value_col, dropna=False
+    )
+    return wide.fillna(0).to_numpy(), wide.columns
+
+
+def main():
+    import pandas as pd
+
+    from gradient_boosting import feature_matrix, make_model
+
+    merged_df = load_merged_df()
+    # The total is modelled as an extra "Warengruppe 0" with the same features;
+    # days without sales of a Warengruppe count as 0 (e.g. Seasonal Bread)
+    merged_df[TARGET] = merged_df[TARGET].fillna(0)
+    totals = merged_df.groupby("Datum", as_index=False).first()
+    totals[TARGET] = merged_df.groupby("Datum")[TARGET].sum().to_numpy()
+    totals["Warengruppe"] = 0
+    stacked = pd.concat([totals, merged_df], ignore_index=True)
+    stacked = stacked.sort_values(["Datum", "Warengruppe"], ignore_index=True)
+
+    training_df, validation_df, test_df = split_by_date(stacked)
+    training_df = training_df.copy()
+    validation_df = validation_df.copy()
+
+    X_train, X_val = feature_matrix(training_df), feature_matrix(validation_df)
+    modell = make_model(learning_rate=0.1, max_leaf_nodes=63)
+    modell.fit(X_train, training_df[TARGET].to_numpy())
+    training_df["pred"] = modell.predict(X_train)
+    validation_df["pred"] = modell.predict(X_val)
+
+    S = summing_matrix(n_branches=1)
+    y_true, _ = panel_to_matrix(validation_df, TARGET)
+    base, _ = panel_to_matrix(validation_df, "pred")
+    residuals = (
+        panel_to_matrix(training_df, TARGET)[0]
+        - panel_to_matrix(training_df, "pred")[0]
+    )
+    proportions = historical_proportions(panel_to_matrix(training_df, TARGET)[0][1:])
+
+    forecasts = {
+        "base": base,
+        "bottom_up": bottom_up(S, base[1:]),
+        "top_down": top_down(S, base[0], proportions),
+        "wls_struct": reconcile(S, base, "wls_struct"),
+        "mint_shrink": reconcile(S, base, "mint_shrink", residuals),
+    }
+
+    # MAPE per level (0 = total, 1-6 = Warengruppen) on the validation year
+    levels = np.repeat(np.arange(S.shape[0]), y_true.shape[1])
+    print("MAPE (Validierung) pro Ebene: Gesamt, WG 1-6")
+    for name, forecast in forecasts.items():
+        y = np.where(y_true == 0, np.nan, y_true).ravel()
+        _, values = forecast_metrics(y, np.asarray(forecast).ravel(), levels)
+        print(f"  {name:<12}" + " ".join(f"{v:6.2f}" for v in values["MAPE"]))
+
+
+if __name__ == "__main__":
+    main()
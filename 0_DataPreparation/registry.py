@@ -0,0 +1,139 @@
+import datetime
+import functools
+import json
+import os
+
+import joblib
+
+REGISTRY_DIR = "models"
+
+
+@functools.lru_cache(maxsize=32)
+def _load_bundle(path, mtime):
+    # Process-wide LRU cache; mtime is part of the key so a rewritten file is
+    # read again. numpy arrays inside the models are memory mapped, not copied.
+    return joblib.load(path, mmap_mode="r")
+
+
+class ModelRegistry:
+    """Local store of fitted models, one bundle file per branch and version.
+
+    Layout::
+
+        models/<branch>/manifest.json   versions with data hash, metrics, date
+        models/<branch>/v<version>.joblib   {Warengruppe: fitted model}
+
+    All Warengruppen of a branch are saved in one file, so load_branch() needs a
+    single read. Loaded bundles are kept in a process-wide LRU cache.
+    """
+
+    def __init__(self, root=REGISTRY_DIR):
+        self.root = root
+
+    def _manifest_path(self, branch):
+        return os.path.join(self.root, str(branch), "manifest.json")
+
+    def manifest(self, branch):
+        path = self._manifest_path(branch)
+        if not os.path.exists(path):
+            return {"branch": branch, "versions": []}
+        with open(path) as f:
+            return json.load(f)
+
+    def save_branch(self, branch, models, data_hash, metrics=None):
+        """Store {Warengruppe: model} as a new version; returns the version number."""
+        manifest = self.manifest(branch)
+        version = max((v["version"] for v in manifest["versions"]), default=0) + 1
+        filename = f"v{version}.joblib"
+
+        os.makedirs(os.path.join(self.root, str(branch)), exist_ok=True)
+        # Uncompressed, so that numpy arrays can be memory mapped when loading
+        joblib.dump(models, os.path.join(self.root, str(branch), filename))
+
+        manifest["versions"].append(
+            {
+                "version": version,
+                "file": filename,
+                "warengruppen": sorted(int(wg) for wg in models),
+                "data_hash": data_hash,
+                "metrics": metrics or {},
+                "created": datetime.datetime.now().isoformat(timespec="seconds"),
+            }
+        )
+        with open(self._manifest_path(branch), "w") as f:
+            json.dump(manifest, f, indent=2)
+        return version
+
+    def load_branch(self, branch, version=None):
+        """All models of a branch ({Warengruppe: model}); latest version by default."""
+        versions = self.manifest(branch)["versions"]
+        if not versions:
+            raise FileNotFoundError(f"No models registered for branch {branch!r}")
+        if version is None:
+            entry = versions[-1]
+        else:
+            entry = next((v for v in versions if v["version"] == version), None)
+            if entry is None:
+                raise FileNotFoundError(f"Branch {branch!r} has no version {version}")
+
+        path = os.path.join(self.root, str(branch), entry["file"])
+        return _load_bundle(path, os.path.getmtime(path))
+
+    def load(self, branch, warengruppe, version=None):
+        return self.load_branch(branch, version)[warengruppe]
+
+
+def main():
+    import time
+
+    import numpy as np
+
+    from features import FEATURES, TARGET, data_hash, load_merged_df, split_by_date
+    from gradient_boosting import make_model
+    from metrics import mape_per_warengruppe
+
+    merged_df = load_merged_df()
+    training_df, validation_df, test_df = split_by_date(merged_df)
+    training_df = training_df.dropna(subset=[TARGET])
+    validation_df = validation_df.dropna(subset=[TARGET])
+
+    # One model per Warengruppe for the (only) branch
+    models, predictions = {}, np.empty(len(validation_df))
+    for wg in range(1, 7):
+        train_wg = training_df[training_df["Warengruppe"] == wg]
+        val_mask = (validation_df["Warengruppe"] == wg).to_numpy()
+        modell = make_model(max_iter=300).fit(
+            train_wg[FEATURES].to_numpy(np.float32), train_wg[TARGET].to_numpy()
+        )
+        predictions[val_mask] = modell.predict(
+            validation_df.loc[val_mask, FEATURES].to_numpy(np.float32)
+        )
+        models[wg] = modell
+
+    mape = mape_per_warengruppe(
+        validation_df["Warengruppe"].to_numpy(),
+        validation_df[TARGET].to_numpy(),
+        predictions,
+    )
+    key = data_hash(
+        {
+            "X": training_df[FEATURES].to_numpy(np.float32),
+            "y": training_df[TARGET].to_numpy(),
+        }
+    )
+
+    registry = ModelRegistry()
+    version = registry.save_branch("Kiel", models, key, {"MAPE": mape})
+    print(f"Version {version} für Filiale Kiel gespeichert, MAPE: {mape}")
+
+    start = time.perf_counter()
+    registry.load_branch("Kiel")
+    first = time.perf_counter() - start
+    start = time.perf_counter()
+    registry.load_branch("Kiel")
+    second = time.perf_counter() - start
+    print(f"Laden: {first * 1000:.1f} ms, aus dem Cache: {second * 1000:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+import hashlib
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+from threadpoolctl import threadpool_limits
+
+from features import TARGET, data_hash, load_merged_df, split_by_date
+from gradient_boosting import feature_matrix, make_model
+from metrics import mape_per_warengruppe
+
+CACHE_DIR = ".tuning_cache"
+
+# Arrays of the current worker process (views on shared memory)
+_ARRAYS = {}
+
+
+def _to_shared(arrays):
+    """Copy arrays into shared memory blocks; returns (blocks, specs for workers)."""
+    blocks, specs = [], {}
+    for name, array in arrays.items():
+        block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+        blocks.append(block)
+        specs[name] = (block.name, array.shape, array.dtype.str)
+    return blocks, specs
+
+
+def _attach(specs):
+    # Worker initializer: map the shared blocks, no copy of the data. The pool
+    # already uses all cores, so each worker trains single-threaded (make_model()
+    # loads sklearn and its OpenMP runtime first, so the limit applies to it).
+    make_model()
+    threadpool_limits(limits=1)
+    for name, (block_name, shape, dtype) in specs.items():
+        block = shared_memory.SharedMemory(name=block_name)
+        _ARRAYS[name] = (block, np.ndarray(shape, dtype=dtype, buffer=block.buf))
+
+
+def _evaluate(config, budget):
+    X_train = _ARRAYS["X_train"][1]
+    y_train = _ARRAYS["y_train"][1]
+    X_val = _ARRAYS["X_val"][1]
+    y_val = _ARRAYS["y_val"][1]
+    wg_val = _ARRAYS["wg_val"][1]
+
+    modell = make_model(**config, max_iter=budget).fit(X_train, y_train)
+    mape = mape_per_warengruppe(wg_val, y_val, modell.predict(X_val))
+    return float(np.mean(list(mape.values())))
+
+
+def _cache_path(config, budget, data_key, cache_dir):
+    # Keyed on the fully resolved model parameters, so changed defaults in
+    # make_model() do not reuse old scores
+    params = make_model(**config, max_iter=budget).get_params()
+    key = json.dumps(params, sort_keys=True, default=str)
+    name = hashlib.sha1((key + data_key).encode()).hexdigest()
+    return os.path.join(cache_dir, f"{name}.json")
+
+
+def successive_halving(
+    configs,
+    arrays,
+    min_budget=50,
+    max_budget=800,
+    eta=3,
+    n_jobs=None,
+    cache_dir=CACHE_DIR,
+):
+    """Successive-halving search over gradient boosting configs.
+
+    Every rung trains all remaining configs with the current budget (max_iter) in a
+    process pool and keeps the best 1/eta of them. arrays must contain X_train,
+    y_train, X_val, y_val and wg_val; they are placed in shared memory once. Scores
+    are cached as json files keyed by config, budget and data hash, so a rerun only
+    trains the trials that are not finished yet.
+
+    Returns (score, config, budget) of the best trial over all rungs; a config can
+    score better with a smaller budget than after the last rung.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    data_key = data_hash(arrays)
+    blocks, specs = _to_shared(arrays)
+
+    try:
+        with ProcessPoolExecutor(
+            max_workers=n_jobs, initializer=_attach, initargs=(specs,)
+        ) as pool:
+            remaining = list(configs)
+            budget = min_budget
+            best = None
+            while True:
+                scores = {}
+                pending = {}
+                for i, config in enumerate(remaining):
+                    path = _cache_path(config, budget, data_key, cache_dir)
+                    if os.path.exists(path):
+                        with open(path) as f:
+                            scores[i] = json.load(f)["score"]
+                    else:
+                        pending[i] = pool.submit(_evaluate, config, budget)
+
+                for i, future in pending.items():
+                    scores[i] = future.result()
+                    path = _cache_path(remaining[i], budget, data_key, cache_dir)
+                    with open(path, "w") as f:
+                        json.dump(
+                            {
+                                "config": remaining[i],
+                                "budget": budget,
+                                "score": scores[i],
+                            },
+                            f,
+                        )
+
+                ranked = sorted(
+                    ((scores[i], remaining[i]) for i in scores), key=lambda x: x[0]
+                )
+                print(
+                    f"Budget {budget}: {len(remaining)} Konfigurationen "
+                    f"({len(remaining) - len(pending)} aus dem Cache), "
+                    f"beste MAPE {ranked[0][0]:.2f}%"
+                )
+                if best is None or ranked[0][0] < best[0]:
+                    best = (ranked[0][0], ranked[0][1], budget)
+
+                if budget >= max_budget or len(remaining) == 1:
+                    return best
+                remaining = [
+                    config for _, config in ranked[: max(1, len(ranked) // eta)]
+                ]
+                budget = min(budget * eta, max_budget)
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+
+def main():
+    start = time.perf_counter()
+
+    merged_df = load_merged_df()
+    training_df, validation_df, test_df = split_by_date(merged_df)
+    training_df = training_df.dropna(subset=[TARGET])
+    validation_df = validation_df.dropna(subset=[TARGET])
+
+    X_train, X_val = feature_matrix(training_df), feature_matrix(validation_df)
+    arrays = {
+        "X_train": X_train,
+        "y_train": training_df[TARGET].to_numpy(),
+        "X_val": X_val,
+        "y_val": validation_df[TARGET].to_numpy(),
+        "wg_val": validation_df["Warengruppe"].to_numpy(),
+    }
+
+    grid = {
+        "learning_rate": [0.03, 0.1],
+        "max_leaf_nodes": [15, 31, 63],
+        "min_samples_leaf": [10, 40],
+        "l2_regularization": [0.0, 1.0],
+    }
+    configs = [dict(zip(grid, values)) for values in itertools.product(*grid.values())]
+
+    score, config, budget = successive_halving(configs, arrays)
+
+    print("\nBeste Konfiguration:", config, f"(max_iter={budget})")
+    print(f"MAPE (Validierung): {score:.2f}%")
+    print(f"Laufzeit: {time.perf_counter() - start:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from features import TEST_END, TRAIN_START, WEATHER_COLUMNS, read_internal
+
+# Sales are expected between the start of training and the end of the test year
+DATE_MIN = TRAIN_START
+DATE_MAX = TEST_END
+
+SCHEMA = {
+    "umsatzdaten": ["id", "Datum", "Warengruppe", "Umsatz"],
+    "wetter": ["Datum"] + WEATHER_COLUMNS,
+    "kiwo": ["Datum", "KielerWoche"],
+}
+
+Check = namedtuple("Check", ["name", "severity", "n_bad", "message"])
+
+
+class DataValidationError(ValueError):
+    def __init__(self, report):
+        super().__init__(format_report(report))
+        self.report = report
+
+
+def format_report(report):
+    lines = []
+    for check in report:
+        status = "ok" if check.n_bad == 0 else check.severity.upper()
+        lines.append(f"[{status:<7}] {check.name:<28} {check.message}")
+    return "\n".join(lines)
+
+
+def _check(report, name, severity, bad, message, fail_fast):
+    # bad: boolean array or count; fatal checks stop the validation immediately
+    n_bad = int(np.count_nonzero(bad)) if not np.isscalar(bad) else int(bad)
+    report.append(Check(name, severity, n_bad, message if n_bad else "-"))
+    if n_bad and severity == "fatal" and fail_fast:
+        raise DataValidationError(report)
+
+
+def validate_inputs(umsatzdaten, wetter, kiwo, fail_fast=True):
+    """Check the raw tables before they are merged.
+
+    Checks run from cheap to expensive as whole-column operations: schema, dates,
+    uniqueness of Datum/Warengruppe and the yymmddX id, value ranges, missing
+    weather and gaps in the sales dates. With fail_fast a fatal finding raises
+    DataValidationError right away; otherwise all checks run and the checks that
+    need a parsed Datum and a valid Warengruppe only look at the rows that have both.
+
+    Returns the report (list of Check); warnings do not raise.
+    """
+    report = []
+    tables = {"umsatzdaten": umsatzdaten, "wetter": wetter, "kiwo": kiwo}
+
+    # Schema
+    for table, columns in SCHEMA.items():
+        missing = [col for col in columns if col not in tables[table].columns]
+        _check(
+            report,
+            f"schema {table}",
+            "fatal",
+            len(missing),
+            f"missing columns {missing}",
+            fail_fast,
+        )
+    if any(check.n_bad for check in report):
+        raise DataValidationError(report)
+
+    # Dates must be parseable
+    datum = {}
+    for table, df in tables.items():
+        datum[table] = pd.to_datetime(df["Datum"], errors="coerce")
+        bad = datum[table].isna().to_numpy()
+        _check(
+            report,
+            f"dates {table}",
+            "fatal",
+            bad,
+            f"{bad.sum()} unparseable Datum",
+            fail_fast,
+        )
+
+    sales_dates = datum["umsatzdaten"].to_numpy()
+    warengruppe = pd.to_numeric(umsatzdaten["Warengruppe"], errors="coerce").to_numpy()
+    umsatz = pd.to_numeric(umsatzdaten["Umsatz"], errors="coerce").to_numpy()
+
+    # Ranges
+    bad = (sales_dates < np.datetime64(DATE_MIN)) | (
+        sales_dates > np.datetime64(DATE_MAX)
+    )
+    _check(
+        report,
+        "sales date range",
+        "fatal",
+        bad,
+        f"{bad.sum()} rows outside {DATE_MIN}..{DATE_MAX}",
+        fail_fast,
+    )
+    wg_ok = np.isin(warengruppe, np.arange(1, 7))
+    bad = ~wg_ok
+    _check(report, "Warengruppe 1-6", "fatal", bad, f"{bad.sum()} invalid", fail_fast)
+    bad = np.isnan(umsatz) | (umsatz < 0)
+    _check(
+        report, "Umsatz >= 0", "fatal", bad, f"{bad.sum()} missing/negative", fail_fast
+    )
+    kiwo_values = pd.to_numeric(kiwo["KielerWoche"], errors="coerce").to_numpy()
+    bad = ~np.isin(kiwo_values, [0, 1])
+    _check(report, "KielerWoche 0/1", "fatal", bad, f"{bad.sum()} invalid", fail_fast)
+
+    # Rows that passed the fatal Datum/Warengruppe checks (all rows with fail_fast)
+    valid = ~np.isnat(sales_dates) & wg_ok
+    sales_dates = sales_dates[valid]
+    warengruppe = warengruppe[valid].astype(np.int64)
+
+    # Uniqueness: one row per (Datum, Warengruppe) and a matching yymmddX id
+    expected_id = (
+        datum["umsatzdaten"][valid].dt.strftime("%y%m%d").to_numpy().astype(np.int64)
+        * 10
+        + warengruppe
+    )
+    ids = pd.to_numeric(umsatzdaten["id"], errors="coerce").to_numpy()[valid]
+    bad = ids != expected_id
+    _check(
+        report, "id = yymmddX", "fatal", bad, f"{bad.sum()} mismatching ids", fail_fast
+    )
+    bad = pd.Series(expected_id).duplicated().to_numpy()
+    _check(
+        report,
+        "unique Datum/WG",
+        "fatal",
+        bad,
+        f"{bad.sum()} duplicated rows",
+        fail_fast,
+    )
+    for table in ("wetter", "kiwo"):
+        bad = datum[table].duplicated().to_numpy()
+        _check(
+            report,
+            f"unique Datum {table}",
+            "fatal",
+            bad,
+            f"{bad.sum()} duplicated",
+            fail_fast,
+        )
+
+    # Missing weather on days with sales (the models can handle NaN)
+    sales_days = np.unique(sales_dates.astype("datetime64[D]"))
+    weather_dates = datum["wetter"].dropna().to_numpy().astype("datetime64[D]")
+    no_row = np.count_nonzero(~np.isin(sales_days, weather_dates))
+    on_sales_days = np.isin(weather_dates, sales_days)
+    for col in WEATHER_COLUMNS:
+        values = pd.to_numeric(wetter[col], errors="coerce").to_numpy()
+        values = values[datum["wetter"].notna().to_numpy()]
+        bad = no_row + np.count_nonzero(np.isnan(values[on_sales_days]))
+        _check(
+            report,
+            f"weather {col}",
+            "warning",
+            bad,
+            f"{bad} sales days without value",
+            fail_fast,
+        )
+
+    # Continuity: every date in the sales period for every Warengruppe; the gaps
+    # are the rows the cross join in load_merged_df() fills with NaN sales
+    if len(sales_days) == 0:
+        return report
+    all_days = np.arange(sales_days[0], sales_days[-1] + np.timedelta64(1, "D"))
+    missing_days = len(all_days) - len(sales_days)
+    _check(
+        report,
+        "continuous dates",
+        "warning",
+        missing_days,
+        f"{missing_days} days without any sales",
+        fail_fast,
+    )
+    per_group = np.bincount(warengruppe, minlength=7)[1:]
+    gaps = len(all_days) - per_group
+    _check(
+        report,
+        "gaps per Warengruppe",
+        "warning",
+        gaps.sum(),
+        ", ".join(f"WG{wg}: {n}" for wg, n in enumerate(gaps, start=1) if n),
+        fail_fast,
+    )
+    return report
+
+
+def main():
+    umsatzdaten, wetter, kiwo = read_internal(validate=False)
+    print(format_report(validate_inputs(umsatzdaten, wetter, kiwo, fail_fast=False)))
+
+
+if __name__ == "__main__":
+    main()
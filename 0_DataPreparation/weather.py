@@ -0,0 +1,163 @@
+import abc
+import io
+import json
+import time
+import urllib.parse
+import urllib.request
+
+import pandas as pd
+
+from features import WEATHER_COLUMNS, build_forecast_df
+
+DEFAULT_LOCATION = "Kiel"
+
+
+class WeatherProvider(abc.ABC):
+    """Source of daily weather rows in the format of wetter.csv.
+
+    fetch() gets all locations and dates of a refresh in one call and returns a
+    DataFrame with the columns location, Datum and WEATHER_COLUMNS.
+    """
+
+    @abc.abstractmethod
+    def fetch(self, locations, start, end):
+        """Weather rows for all locations between start and end (inclusive)."""
+
+
+class FileWeatherProvider(WeatherProvider):
+    """Reads one CSV per location (same columns as wetter.csv).
+
+    files maps location -> path; by default the historical Internal/wetter.csv
+    stands in for the Kiel branch.
+    """
+
+    def __init__(self, files=None):
+        self.files = files or {DEFAULT_LOCATION: "Internal/wetter.csv"}
+
+    def fetch(self, locations, start, end):
+        frames = []
+        for location in locations:
+            wetter = pd.read_csv(self.files[location], parse_dates=["Datum"])
+            wetter = wetter[wetter["Datum"].between(start, end)]
+            frames.append(wetter.assign(location=location))
+        return pd.concat(frames, ignore_index=True)[
+            ["location", "Datum"] + WEATHER_COLUMNS
+        ]
+
+
+class HttpWeatherProvider(WeatherProvider):
+    """Fetches forecast rows from a local HTTP service.
+
+    One GET request per refresh:
+    ``{base_url}/weather?locations=a,b&start=YYYY-MM-DD&end=YYYY-MM-DD`` answered
+    with CSV (location, Datum and WEATHER_COLUMNS) or a JSON list of such records.
+    """
+
+    def __init__(self, base_url, timeout=10):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+
+    def fetch(self, locations, start, end):
+        query = urllib.parse.urlencode(
+            {
+                "locations": ",".join(locations),
+                "start": pd.Timestamp(start).strftime("%Y-%m-%d"),
+                "end": pd.Timestamp(end).strftime("%Y-%m-%d"),
+            }
+        )
+        with urllib.request.urlopen(
+            f"{self.base_url}/weather?{query}", timeout=self.timeout
+        ) as response:
+            body = response.read().decode("utf-8")
+            content_type = response.headers.get("Content-Type", "")
+
+        if "json" in content_type:
+            rows = pd.DataFrame(json.loads(body))
+        else:
+            rows = pd.read_csv(io.StringIO(body))
+        rows["Datum"] = pd.to_datetime(rows["Datum"])
+        return rows[["location", "Datum"] + WEATHER_COLUMNS]
+
+
+class WeatherCache:
+    """Local store of weather rows keyed by (location, Datum) with a TTL.
+
+    refresh() is the only method that talks to the provider and does so in bulk
+    for all locations and dates. lookup() only reads the store, so building
+    features for a forecast never waits for a weather request; dates that are not
+    cached (or expired) come back as NaN, which the models treat as missing.
+    """
+
+    def __init__(self, provider, ttl_seconds=6 * 3600, clock=time.monotonic):
+        self.provider = provider
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self._rows = {}  # (location, Datum) -> (fetched_at, tuple of WEATHER_COLUMNS)
+
+    def __len__(self):
+        return len(self._rows)
+
+    def evict_expired(self):
+        now = self.clock()
+        expired = [
+            key
+            for key, (fetched_at, _) in self._rows.items()
+            if now - fetched_at > self.ttl_seconds
+        ]
+        for key in expired:
+            del self._rows[key]
+        return len(expired)
+
+    def refresh(self, locations, start, end, force=False):
+        """Fetch all missing or expired (location, date) rows in one provider call."""
+        self.evict_expired()
+        dates = pd.date_range(start, end, freq="D")
+        if not force and all(
+            (location, day) in self._rows for location in locations for day in dates
+        ):
+            return 0
+
+        rows = self.provider.fetch(list(locations), dates[0], dates[-1])
+        now = self.clock()
+        # Dates the provider has no data for are stored as missing as well, so they
+        # are not requested again before the TTL runs out
+        missing = (float("nan"),) * len(WEATHER_COLUMNS)
+        for location in locations:
+            for day in dates:
+                self._rows[(location, day)] = (now, missing)
+        values = rows[WEATHER_COLUMNS].itertuples(index=False, name=None)
+        for location, day, row in zip(rows["location"], rows["Datum"], values):
+            self._rows[(location, pd.Timestamp(day))] = (now, row)
+        return len(rows)
+
+    def lookup(self, dates, location=DEFAULT_LOCATION):
+        """Cached weather for dates as a DataFrame (Datum + WEATHER_COLUMNS)."""
+        now = self.clock()
+        missing = (float("nan"),) * len(WEATHER_COLUMNS)
+        records = []
+        for day in pd.to_datetime(pd.Index(dates)):
+            entry = self._rows.get((location, day))
+            if entry is None or now - entry[0] > self.ttl_seconds:
+                records.append((day,) + missing)
+            else:
+                records.append((day,) + entry[1])
+        return pd.DataFrame.from_records(records, columns=["Datum"] + WEATHER_COLUMNS)
+
+
+def main():
+    # Stand-in: the historical file acts as the "forecast" for the first days
+    # after the end of the sales data
+    cache = WeatherCache(FileWeatherProvider())
+    start, end = "2019-07-25", "2019-08-05"
+
+    fetched = cache.refresh([DEFAULT_LOCATION], start, end)
+    print(f"{fetched} Wetterzeilen geladen, {len(cache)} im Cache")
+    print(f"Zweiter refresh: {cache.refresh([DEFAULT_LOCATION], start, end)} geladen")
+
+    dates = pd.date_range(start, end, freq="D")
+    forecast_df = build_forecast_df(dates, cache.lookup(dates))
+    print(forecast_df[["Datum", "Warengruppe"] + WEATHER_COLUMNS].head(12))
+
+
+if __name__ == "__main__":
+    main()